@@ -0,0 +1,16 @@
+"""
+API sunucuları (api_server, pure_python_api, lightweight_api) için ortak yardımcılar
+"""
+
+from fastapi import HTTPException, Request
+import orjson
+
+async def read_image(request: Request) -> str:
+    """Request body'den 'image' alanını orjson ile okur (Pydantic model validasyonu yok)"""
+    try:
+        image = orjson.loads(await request.body())["image"]
+    except (orjson.JSONDecodeError, KeyError, TypeError):
+        image = None
+    if not isinstance(image, str):
+        raise HTTPException(status_code=422, detail="'image' alanı (string) gerekli")
+    return image
@@ -4,21 +4,23 @@ Uses only Python standard library + FastAPI
 Memory: ~15-20MB
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
 import uvicorn
 import os
 import base64
 import random
 import colorsys
 from typing import List
+from api_common import read_image
 
 # FastAPI app
 app = FastAPI(
     title="Wound Analysis API - Pure Python",
     description="Ultra minimal wound analysis using only Python standard library",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -30,36 +32,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-class ImageData(BaseModel):
-    image: str
-
-class AnalysisResponse(BaseModel):
-    inflammation_score: float
-    swelling_score: float
-    closure_score: float
-    overall_status: str
-    recommendations: list
-    confidence: float
-    processed_regions: str
-
 def analyze_base64_metadata(image_data: str) -> dict:
     """Base64 metadata ve header'dan basit analiz"""
     try:
-        # Base64 header analizi
-        header = image_data.split(',')[0] if ',' in image_data else image_data[:100]
-        data_part = image_data.split(',')[1] if ',' in image_data else image_data
+        # Base64 header analizi - split() tüm payload'u kopyalar; find + dilimleme
+        # ile sadece header ve ilk 1000 karakter kopyalanır
+        comma = image_data.find(',')
+        header = image_data[:comma] if comma >= 0 else image_data[:100]
+        start = comma + 1
         
         # Base64 string length (dosya boyutu tahmini)
-        data_length = len(data_part)
+        data_length = len(image_data) - start
         estimated_size = (data_length * 3) // 4  # Base64 to bytes approximation
         
-        # Base64 character distribution analysis
-        char_counts = {}
-        for char in data_part[:1000]:  # İlk 1000 karakter
-            char_counts[char] = char_counts.get(char, 0) + 1
-        
-        # Character entropy (çeşitlilik)
-        entropy = len(char_counts)
+        # Character entropy (çeşitlilik) - ilk 1000 karakterdeki farklı karakter sayısı
+        # set() tek C geçişinde sayar, karakter başına dict güncellemesi yok
+        entropy = len(set(image_data[start:start + 1000]))
         
         # Return analysis data
         return {
@@ -102,15 +90,16 @@ def smart_medical_analysis(metadata: dict) -> dict:
     base_swelling = 20 + (random.random() * 30)      # 20-50 range
     base_closure = 60 + (random.random() * 35)       # 60-95 range
     
-    # Apply factors
-    inflammation_score = base_inflammation * size_factor * complexity_factor
-    swelling_score = base_swelling * size_factor * complexity_factor
-    closure_score = base_closure / (size_factor * complexity_factor)
+    # Apply factors - kombine faktör bir kez hesaplanır
+    factor = size_factor * complexity_factor
+    inflammation_score = base_inflammation * factor
+    swelling_score = base_swelling * factor
+    closure_score = base_closure / factor
     
     # Realistic bounds
-    inflammation_score = max(10, min(inflammation_score, 95))
-    swelling_score = max(10, min(swelling_score, 85))
-    closure_score = max(30, min(closure_score, 98))
+    inflammation_score = max(10.0, min(inflammation_score, 95.0))
+    swelling_score = max(10.0, min(swelling_score, 85.0))
+    closure_score = max(30.0, min(closure_score, 98.0))
     
     return {
         'inflammation_score': inflammation_score,
@@ -218,17 +207,19 @@ async def health_check():
         "build_status": "compatible"
     }
 
-@app.post("/api/analyze-wound", response_model=AnalysisResponse)
-async def analyze_wound(data: ImageData):
+@app.post("/api/analyze-wound")
+async def analyze_wound(request: Request):
     """Yara analizi endpoint - Pure Python"""
+    image = await read_image(request)
     try:
-        if not data.image:
+        if not image:
             raise HTTPException(status_code=400, detail="Image data is required")
         
         # Pure Python analysis
-        result = pure_python_analysis(data.image)
+        result = pure_python_analysis(image)
         
-        return AnalysisResponse(**result)
+        # Dict doğrudan orjson ile serialize edilir (response model validasyonu yok)
+        return ORJSONResponse(result)
         
     except Exception as e:
         # En robust error handling
@@ -244,7 +235,7 @@ async def analyze_wound(data: ImageData):
             "confidence": 0.6,
             "processed_regions": "error_fallback"
         }
-        return AnalysisResponse(**fallback_result)
+        return ORJSONResponse(fallback_result)
 
 @app.get("/api/status")
 async def api_status():
@@ -252,7 +243,7 @@ async def api_status():
     return {
         "status": "running",
         "model": "pure_python_metadata_analysis",
-        "dependencies": ["fastapi", "uvicorn", "pydantic"],
+        "dependencies": ["fastapi", "uvicorn", "pydantic", "orjson"],
         "memory_usage": "~15-20MB",
         "render_compatible": True,
         "build_issues": "none",
@@ -267,5 +258,8 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=port,
         reload=False,
-        access_log=False
+        access_log=False,
+        workers=int(os.environ.get("WEB_CONCURRENCY", 1)),  # Render Free Tier: 1 vCPU
+        loop="auto",  # uvloop kuruluysa (Linux) onu, değilse asyncio kullanır
+        http="auto"   # httptools kuruluysa onu, değilse h11 kullanır
     )
@@ -6,16 +6,20 @@ Production Ready Deployment Version
 
 from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
-import base64
 import io
+import time
+import functools
+import orjson
 import uvicorn
 import os
-from wound_analysis_model import analyze_wound_api, WoundAnalysisModel
+from wound_analysis_model import analyze_wound_api, analyze_wound_api_bytes, WoundAnalysisModel
 import logging
+from datetime import datetime
 
 # Logging setup
 logging.basicConfig(level=logging.INFO)
@@ -27,7 +31,8 @@ app = FastAPI(
     description="Ameliyat Sonrası Yara Takibi ve Analizi API - Production Version",
     version="1.0.0",
     docs_url="/api/docs",  # Production'da docs URL'sini değiştir
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware - Production'da specific origins kullan
@@ -39,6 +44,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Upload limiti (5MB) - base64 data-URL'de 4/3 katı + header payı
+MAX_IMAGE_BYTES = 5 * 1024 * 1024
+MAX_IMAGE_DATA_LENGTH = MAX_IMAGE_BYTES * 4 // 3 + 1024
+
 # Statik dosyalar (frontend için)
 # app.mount("/", StaticFiles(directory="frontend", html=True), name="frontend")
 
@@ -57,36 +66,60 @@ class ImageAnalysisRequest(BaseModel):
     notes: Optional[str] = None
 
 class ImageAnalysisResponse(BaseModel):
+    model_config = ConfigDict(extra='forbid', frozen=True)
+    
     success: bool
     inflammation_score: float
     swelling_score: float
     closure_score: float
+    # "good" | "warning" | "critical"; "no_wound": görüntü işlendi ama yara bölgesi
+    # bulunamadı; "error": görüntü decode/analiz edilemedi
     overall_status: str
     recommendations: List[str]
     confidence: float
     processed_regions: dict
     timestamp: str
 
+# Response serializer bir kez derlenir, her istekte yeniden kurulmaz
+_ANALYSIS_RESPONSE_ADAPTER = TypeAdapter(ImageAnalysisResponse)
+
 class HealthCheckResponse(BaseModel):
     status: str
     message: str
     model_loaded: bool
     version: str
 
+# Statik yanıtlar - içerik model yüklendikten sonra değişmez, JSON byte'ları bir kez
+# üretilir. Response nesnesi paylaşılmaz (middleware header'ları yerinde günceller)
+_ROOT_BODY = orjson.dumps({"message": "HealTrack AI API - v1.0.0", "docs": "/api/docs"})
+_HEALTH_BODY = orjson.dumps(HealthCheckResponse(
+    status="healthy" if model else "model_error",
+    message="HealTrack AI API çalışıyor" if model else "Model yüklenemedi",
+    model_loaded=model is not None,
+    version="1.0.0"
+).model_dump())
+_MODEL_INFO_BODY = orjson.dumps({
+    "model_name": "WoundAnalysisModel v1.0",
+    "capabilities": [
+        "Kızarıklık tespiti",
+        "Şişlik analizi", 
+        "Kapanma durumu değerlendirmesi"
+    ],
+    "supported_formats": ["JPG", "PNG", "JPEG"],
+    "max_file_size": "5MB",
+    "processing_time": "~2-5 saniye",
+    "model_loaded": model is not None
+})
+
 @app.get("/", include_in_schema=False)
 async def root():
     """Root endpoint - Production için"""
-    return {"message": "HealTrack AI API - v1.0.0", "docs": "/api/docs"}
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 @app.get("/health", response_model=HealthCheckResponse)
 async def health_check():
     """Sistem durumu kontrolü"""
-    return HealthCheckResponse(
-        status="healthy" if model else "model_error",
-        message="HealTrack AI API çalışıyor" if model else "Model yüklenemedi",
-        model_loaded=model is not None,
-        version="1.0.0"
-    )
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 @app.post("/api/analyze-wound", response_model=ImageAnalysisResponse)
 async def analyze_wound_endpoint(request: ImageAnalysisRequest):
@@ -99,6 +132,13 @@ async def analyze_wound_endpoint(request: ImageAnalysisRequest):
             detail="AI Model henüz yüklenmedi. Lütfen daha sonra tekrar deneyin."
         )
     
+    # Boyut kontrolü - base64 decode ve görüntü decode'undan önce
+    if len(request.image_data) > MAX_IMAGE_DATA_LENGTH:
+        raise HTTPException(
+            status_code=413,
+            detail="Görüntü boyutu 5MB'dan büyük olamaz"
+        )
+    
     try:
         logger.info(f"Yara analizi başlatıldı - Patient ID: {request.patient_id}")
         
@@ -109,16 +149,17 @@ async def analyze_wound_endpoint(request: ImageAnalysisRequest):
                 detail="Geçersiz görüntü formatı. Base64 encoded image gerekli."
             )
         
-        # Model analizi
-        result = analyze_wound_api(request.image_data)
+        # Model analizi - CPU yoğun OpenCV işi threadpool'da, event loop bloklanmaz
+        result = await run_in_threadpool(analyze_wound_api, request.image_data)
         
         # Timestamp ekle
-        from datetime import datetime
         timestamp = datetime.now().isoformat()
         
         logger.info(f"Analiz tamamlandı - Status: {result['overall_status']}")
         
-        return ImageAnalysisResponse(
+        # Sonuç modelin kendi çıktısı - yeniden validasyon yapmadan oluştur ve
+        # derlenmiş serializer ile doğrudan JSON byte'larına çevir
+        response = ImageAnalysisResponse.model_construct(
             success=True,
             inflammation_score=result["inflammation_score"],
             swelling_score=result["swelling_score"],
@@ -129,7 +170,13 @@ async def analyze_wound_endpoint(request: ImageAnalysisRequest):
             processed_regions=result["processed_regions"],
             timestamp=timestamp
         )
+        return Response(
+            content=_ANALYSIS_RESPONSE_ADAPTER.dump_json(response),
+            media_type="application/json"
+        )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Analiz hatası: {str(e)}")
         raise HTTPException(
@@ -152,20 +199,16 @@ async def upload_image(file: UploadFile = File(...)):
         
         # Dosya boyutu kontrolü (5MB limit)
         content = await file.read()
-        if len(content) > 5 * 1024 * 1024:
+        if len(content) > MAX_IMAGE_BYTES:
             raise HTTPException(
                 status_code=400,
                 detail="Dosya boyutu 5MB'dan büyük olamaz"
             )
         
-        # Base64'e çevir
-        base64_data = base64.b64encode(content).decode('utf-8')
-        image_data = f"data:{file.content_type};base64,{base64_data}"
-        
-        # Analiz et
+        # Analiz et - ham byte'lar doğrudan decode edilir (base64 turu yok)
         if model:
-            result = analyze_wound_api(image_data)
-            return JSONResponse(content={
+            result = await run_in_threadpool(analyze_wound_api_bytes, content)
+            return ORJSONResponse({
                 "success": True,
                 "filename": file.filename,
                 "analysis": result
@@ -176,6 +219,8 @@ async def upload_image(file: UploadFile = File(...)):
                 detail="AI Model henüz hazır değil"
             )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Upload hatası: {str(e)}")
         raise HTTPException(
@@ -186,35 +231,47 @@ async def upload_image(file: UploadFile = File(...)):
 @app.get("/api/model-info")
 async def get_model_info():
     """Model bilgileri"""
+    return Response(content=_MODEL_INFO_BODY, media_type="application/json")
+
+def ttl_cache(seconds: float):
+    """Argümansız fonksiyonun sonucunu `seconds` saniye boyunca saklar"""
+    def decorator(func):
+        cache = {}
+        
+        @functools.wraps(func)
+        def wrapper():
+            now = time.monotonic()
+            if cache and now < cache["expires"]:
+                return cache["value"]
+            value = func()
+            cache["value"] = value
+            cache["expires"] = now + seconds
+            return value
+        return wrapper
+    return decorator
+
+@ttl_cache(seconds=2)
+def _system_metrics() -> dict:
+    """psutil okumaları - health probe'lar her istekte /proc okumasın"""
+    import psutil
+    import platform
+    
+    memory = psutil.virtual_memory()
     return {
-        "model_name": "WoundAnalysisModel v1.0",
-        "capabilities": [
-            "Kızarıklık tespiti",
-            "Şişlik analizi", 
-            "Kapanma durumu değerlendirmesi"
-        ],
-        "supported_formats": ["JPG", "PNG", "JPEG"],
-        "max_file_size": "5MB",
-        "processing_time": "~2-5 saniye",
-        "model_loaded": model is not None
+        "platform": platform.system(),
+        "python_version": platform.python_version(),
+        "cpu_count": psutil.cpu_count(),
+        "memory_total": f"{memory.total // (1024**3)} GB",
+        "memory_available": f"{memory.available // (1024**3)} GB",
+        "cpu_percent": psutil.cpu_percent()
     }
 
 @app.get("/api/metrics")
 async def get_system_metrics():
     """Sistem metrikleri"""
     try:
-        import psutil
-        import platform
-        
         return {
-            "system": {
-                "platform": platform.system(),
-                "python_version": platform.python_version(),
-                "cpu_count": psutil.cpu_count(),
-                "memory_total": f"{psutil.virtual_memory().total // (1024**3)} GB",
-                "memory_available": f"{psutil.virtual_memory().available // (1024**3)} GB",
-                "cpu_percent": psutil.cpu_percent()
-            },
+            "system": _system_metrics(),
             "api": {
                 "status": "running",
                 "model_loaded": model is not None
@@ -235,14 +292,14 @@ async def get_system_metrics():
 # Error handlers
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=404,
         content={"error": "Endpoint bulunamadı", "docs": "/api/docs"}
     )
 
 @app.exception_handler(500)
 async def internal_error_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"error": "İç sunucu hatası", "message": str(exc)}
     )
@@ -260,5 +317,7 @@ if __name__ == "__main__":
         port=int(os.getenv("PORT", 8000)),
         reload=False,  # Production'da False
         log_level="info",
-        workers=1  # CPU sayısına göre artırın
+        workers=int(os.getenv("WEB_CONCURRENCY", 1)),  # CPU sayısına göre artırın
+        loop="auto",  # uvicorn[standard] ile uvloop
+        http="auto"   # uvicorn[standard] ile httptools
     )
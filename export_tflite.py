@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Kızarıklık CNN'i için offline TFLite dönüştürme aracı
+API sunucusu bu modülü import etmez; dönüştürme deploy öncesi elle çalıştırılır
+
+Kullanım:
+    python export_tflite.py int8 model_int8.tflite --images kalibrasyon_klasoru/
+    python export_tflite.py fp16 model_fp16.tflite
+"""
+
+import argparse
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List
+
+import cv2
+import numpy as np
+import tensorflow as tf
+
+from wound_analysis_model import InflammationDetector, WoundImageProcessor
+
+# GPU delegate kütüphanesi (Android/Linux GPU build'lerinde bulunur)
+GPU_DELEGATE = "libGpuDelegateV2.so"
+
+def export_int8(representative_images: List[np.ndarray], path: str) -> None:
+    """CNN'i int8 TFLite FlatBuffer'a çevirir (post-training quantization)
+
+    representative_images: 224x224x3, 0-1 aralığında float görüntüler (kalibrasyon için)
+    """
+    def representative_dataset():
+        for image in representative_images:
+            yield [np.expand_dims(image.astype(np.float32), 0)]
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(InflammationDetector().model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = representative_dataset
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.uint8
+    converter.inference_output_type = tf.uint8
+
+    with open(path, "wb") as f:
+        f.write(converter.convert())
+
+def export_fp16(path: str) -> None:
+    """CNN'i float16 TFLite FlatBuffer'a çevirir
+
+    Ağırlıklar fp16 saklanır (boyut yarıya iner); GPU delegate doğrudan fp16 çalışır,
+    CPU'da ağırlıklar yüklemede fp32'ye açılır. Kalibrasyon verisi gerekmez
+    """
+    converter = tf.lite.TFLiteConverter.from_keras_model(InflammationDetector().model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.target_spec.supported_types = [tf.float16]
+
+    with open(path, "wb") as f:
+        f.write(converter.convert())
+
+# tf.lite.Interpreter thread-safe değil - interpreter'lar thread başına, model yolu
+# anahtarıyla saklanır; aynı thread aynı yolu tekrar istediğinde yeniden yüklenmez
+_tls = threading.local()
+
+def _cached_interpreters() -> Dict[tuple, "tf.lite.Interpreter"]:
+    cache = getattr(_tls, "interpreters", None)
+    if cache is None:
+        cache = _tls.interpreters = {}
+    return cache
+
+def load_interpreter(path: str) -> "tf.lite.Interpreter":
+    """Dönüştürülmüş .tflite modelini (çağıran thread için) bir kez yükleyip tensörleri ayırır"""
+    cache = _cached_interpreters()
+    interpreter = cache.get(("cpu", path))
+    if interpreter is None:
+        interpreter = tf.lite.Interpreter(model_path=path)
+        interpreter.allocate_tensors()
+        cache[("cpu", path)] = interpreter
+    return interpreter
+
+def load_fp16_interpreter(path: str) -> "tf.lite.Interpreter":
+    """fp16 .tflite modelini GPU delegate ile yükler; delegate yoksa CPU'ya düşer
+
+    Önbellek load_interpreter gibi thread başına ve model yoluna göre tutulur
+    """
+    cache = _cached_interpreters()
+    interpreter = cache.get(("gpu", path))
+    if interpreter is None:
+        try:
+            delegate = tf.lite.experimental.load_delegate(GPU_DELEGATE)
+            interpreter = tf.lite.Interpreter(model_path=path, experimental_delegates=[delegate])
+        except (ValueError, RuntimeError, OSError):
+            # GPU / delegate kütüphanesi yok - CPU interpreter
+            interpreter = tf.lite.Interpreter(model_path=path)
+        interpreter.allocate_tensors()
+        cache[("gpu", path)] = interpreter
+    return interpreter
+
+def load_calibration_images(folder: str) -> List[np.ndarray]:
+    """Klasördeki görüntüleri CNN girdisi formatına (224x224, 0-1 float) getirir"""
+    processor = WoundImageProcessor()
+    images = []
+    for file in sorted(Path(folder).iterdir()):
+        image = cv2.imread(str(file), cv2.IMREAD_COLOR)
+        if image is not None:
+            images.append(processor.preprocess_image(image))
+    return images
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Kızarıklık CNN'ini TFLite'a dönüştür")
+    parser.add_argument("mode", choices=["int8", "fp16"], help="Quantization türü")
+    parser.add_argument("output", help="Çıktı .tflite dosyası")
+    parser.add_argument("--images", help="int8 kalibrasyonu için görüntü klasörü")
+    args = parser.parse_args()
+
+    if args.mode == "int8":
+        if not args.images:
+            parser.error("int8 dönüştürme için --images gerekli")
+        images = load_calibration_images(args.images)
+        if not images:
+            print("❌ Kalibrasyon görüntüsü bulunamadı")
+            return 1
+        export_int8(images, args.output)
+        load_interpreter(args.output)
+    else:
+        export_fp16(args.output)
+        load_fp16_interpreter(args.output)
+
+    # Dönüştürülen model yukarıda yüklenerek doğrulandı
+    print(f"✅ {args.output} oluşturuldu")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
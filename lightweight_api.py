@@ -3,18 +3,30 @@ Lightweight API Server - Render Free Tier (512MB) için optimize edilmiş
 Memory kullanımı: ~80-150MB
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from api_common import read_image
 import uvicorn
 from lightweight_model import analyze_wound_api
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import os
+import sys
+
+# Process handle bir kez oluşturulur; /api/status her çağrıda sadece RSS okur
+try:
+    import psutil
+    _PROC = psutil.Process(os.getpid())
+except ImportError:
+    _PROC = None
 
 # FastAPI app
 app = FastAPI(
     title="Wound Analysis API - Lightweight",
     description="Memory-optimized wound analysis for free hosting",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -26,17 +38,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-class ImageData(BaseModel):
-    image: str
-
-class AnalysisResponse(BaseModel):
-    inflammation_score: float
-    swelling_score: float
-    closure_score: float
-    overall_status: str
-    recommendations: list
-    confidence: float
-    processed_regions: str
+# Analiz CPU-bound (base64 + OpenCV); event loop'u bloklamamak için threadpool'da
+# çalışır. OpenCV çağrıları GIL'i bıraktığı için istekler çekirdekler arasında örtüşür
+_EXECUTOR = ThreadPoolExecutor(max_workers=min(os.cpu_count() or 1, 4))
 
 @app.get("/")
 async def root():
@@ -61,17 +65,19 @@ async def health_check():
         "memory_optimized": True
     }
 
-@app.post("/api/analyze-wound", response_model=AnalysisResponse)
-async def analyze_wound(data: ImageData):
+@app.post("/api/analyze-wound")
+async def analyze_wound(request: Request):
     """Yara analizi endpoint - memory optimized"""
+    image = await read_image(request)
     try:
-        if not data.image:
+        if not image:
             raise HTTPException(status_code=400, detail="Image data is required")
         
         # Lightweight analysis
-        result = analyze_wound_api(data.image)
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(_EXECUTOR, analyze_wound_api, image)
         
-        return AnalysisResponse(**result)
+        return ORJSONResponse(result)
         
     except Exception as e:
         raise HTTPException(
@@ -82,27 +88,28 @@ async def analyze_wound(data: ImageData):
 @app.get("/api/status")
 async def api_status():
     """API durumu"""
-    import psutil
-    import sys
+    fallback = {
+        "status": "running",
+        "memory_usage_mb": "unknown",
+        "model": "lightweight"
+    }
+    # psutil kurulu değilse bellek bilgisi yok
+    if _PROC is None:
+        return fallback
     
     try:
         # Memory usage info
-        process = psutil.Process(os.getpid())
-        memory_mb = process.memory_info().rss / 1024 / 1024
-        
-        return {
-            "status": "running",
-            "memory_usage_mb": round(memory_mb, 2),
-            "python_version": sys.version,
-            "model": "lightweight",
-            "render_compatible": memory_mb < 400
-        }
-    except:
-        return {
-            "status": "running",
-            "memory_usage_mb": "unknown",
-            "model": "lightweight"
-        }
+        memory_mb = _PROC.memory_info().rss / 1024 / 1024
+    except psutil.Error:
+        return fallback
+    
+    return {
+        "status": "running",
+        "memory_usage_mb": round(memory_mb, 2),
+        "python_version": sys.version,
+        "model": "lightweight",
+        "render_compatible": memory_mb < 400
+    }
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8000))
@@ -111,5 +118,8 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=port,
         reload=False,  # Disable reload to save memory
-        access_log=False  # Disable access logs to save memory
+        access_log=False,  # Disable access logs to save memory
+        workers=int(os.environ.get("WEB_CONCURRENCY", 1)),  # Render Free Tier: 1 vCPU
+        loop="auto",  # uvloop kuruluysa (Linux) onu, değilse asyncio kullanır
+        http="auto"   # httptools kuruluysa onu, değilse h11 kullanır
     )
